@@ -146,7 +146,7 @@ parser.add_argument("-V", "--deviation", default=0, help=argparse.SUPPRESS,type=
 
 args = parser.parse_args()
 
-num_provided_args = utilities.count_provided_args(args, parser)
+num_provided_args = utilities.count_provided_args(parser)
 
 if num_provided_args == 0:
     parser.print_help()
@@ -165,6 +165,11 @@ if (args.load_device_settings != None):
         file_data = f.readlines()
         rf_settings.loadDeviceSettingsTemplate(file_data)
 
+#A de Bruijn sequence given with -u is generated in the background while the dongle is set up
+if args.de_bruijn and args.uploaded_payload is not None:
+    alphabet, length = args.uploaded_payload.split()
+    de_bruijn_sequence = utilities.async_de_bruijn_sequence(alphabet, int(length))
+
 if not args.jammer and not args.no_instance:
     try:
         d = RfCat(idx=0)
@@ -239,7 +244,6 @@ if args.de_bruijn:
         print("Executing Attack instead")
         attacks.deBruijn(d)
     else:
-        alphabet, length = args.uploaded_payload.split()
-        sequence = utilities.generate_de_bruijn_sequence(alphabet, int(length))
+        sequence = de_bruijn_sequence.result()
         print(f"Generated de Bruijn sequence: {sequence}")
 
@@ -1,8 +1,7 @@
 import matplotlib.pyplot as plt
 import matplotlib.pylab as pylab
 import numpy as np
-import sys,subprocess
-from . import RFFunctions as tools
+import sys,subprocess,functools
 sys.dont_write_bytecode = True
 
 #----------Setup Graphing Size-----------#
@@ -12,17 +11,30 @@ fig_size[1] = 3
 plt.rcParams["figure.figsize"] = fig_size
 #---------End Graphing Size Setup---------#
 
+#----------Image Viewer For This Platform----------#
+image_viewer = {'linux':'eog',
+                'linux2':'eog',
+                'win32':'explorer',    #doubt this works in windows but leaving it here for now
+                'darwin':'open'}.get(sys.platform)
+
 class Clicker():
     '''This class is used to help identify and analyse signals as well as create clickers
     from captures. It uses a known payload and live captures or a logfile of unknown payloads to compare'''
     def __init__(self, captured_payload, keyfob_payloads=[]):
         self.captured_payload = captured_payload
         self.keyfob_payloads = keyfob_payloads
+        self.live_percents = {}  #% match of every signal seen live, kept between presses so repeats are not recompared
+        self.viewer = None  #Image viewer process, reused while it stays open so live updates do not pile up windows
 
     def determineDipSwitches(self, captured_payload):
         ''' This function will return the dip switches as up:down:down:up format based on signal analysis'''
         pass
 
+    def updateLive(self, new_presses):
+        '''Analyses only the presses captured since the last update, signals already seen reuse their % match'''
+        self.keyfob_payloads = new_presses
+        self.liveClicks()
+
     def liveClicks(self):
         '''Compare Signals and Create graphs to compare a live capture with a keyfob press'''
         count = 0
@@ -34,16 +46,15 @@ class Clicker():
         print("----------Start Signals In Press--------------")
         for presses in self.keyfob_payloads:
             for keyfob_payload in presses:
-                #Get binary output of the keyfob captures
-                keyfob_programming_binary = self.payloadsToBinary(keyfob_payload)
+                #Signals are only compared the first time they are seen this session
+                if keyfob_payload not in self.live_percents:
+                    #Get binary output of the keyfob captures
+                    keyfob_programming_binary = self.payloadsToBinary(keyfob_payload)
 
-                #Handle Calculations for likilihood
-                one = ''.join(str(x) for x in captured_payload_binary)
-                two =''.join(str(x) for x in keyfob_programming_binary)
-
-                percent = tools.similar(one,two)
-                graphToPercent[keyfob_payload] = percent
+                    #Handle Calculations for likilihood
+                    self.live_percents[keyfob_payload] = self.binarySimilar(captured_payload_binary, keyfob_programming_binary)
 
+                percent = graphToPercent[keyfob_payload] = self.live_percents[keyfob_payload]
                 print(f"Percent Chance of Match for press is: {percent}")
         print("----------End Signals In Press------------")
         #Send dictionaries of percents and return the signal with the highest % comparison
@@ -71,10 +82,7 @@ class Clicker():
                 keyfob_programming_binary = self.payloadsToBinary(keyfob_payload)
 
                 #Handle Calculations for likilihood
-                one = ''.join(str(x) for x in captured_payload_binary)
-                two =''.join(str(x) for x in keyfob_programming_binary)
-
-                percent = tools.similar(one,two)
+                percent = self.binarySimilar(captured_payload_binary, keyfob_programming_binary)
                 print(f"Percent Chance of Match for press is: {percent}")
 
                 self.createGraph(captured_payload_binary, keyfob_programming_binary)
@@ -83,17 +91,11 @@ class Clicker():
                 plt.close()
 
     def setupNumberPrinting(self, captured_payload_binary, keyfob_programming_binary):
-        '''prints numbers under the graph, reduces the counts in half for readability with a counter'''
-        count = 0
-        for tbit, bit in enumerate(captured_payload_binary):
-            if (count % 2 != 1):
-                plt.text(tbit + 0.5, 3.5, str(bit))
-            count = count +1
-        count = 0
-        for tbit, bit in enumerate(keyfob_programming_binary):
-            if (count % 2 != 1):
-                plt.text(tbit + 0.5, 1.5, str(bit))
-            count = count +1
+        '''prints numbers under the graph, only every other bit is printed for readability'''
+        for tbit in range(0, len(captured_payload_binary), 2):
+            plt.text(tbit + 0.5, 3.5, str(captured_payload_binary[tbit]))
+        for tbit in range(0, len(keyfob_programming_binary), 2):
+            plt.text(tbit + 0.5, 1.5, str(keyfob_programming_binary[tbit]))
 
     def outputImagesComparisons(self, count, live=False):
         '''Outputs image files to compare capture to keyfob presses'''
@@ -103,11 +105,26 @@ class Clicker():
             pylab.savefig("./imageOutput/Graph"+str(count)+".png")
 
 
-    def payloadsToBinary(self, payload):
-        '''Converts hex data into binary and back into lists of binary numbers'''
-        binary = bin(int(payload,16))[2:]
-        results = list(map(int, list(binary)))
-        return results
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def payloadsToBinary(payload):
+        '''Converts hex data into an array of binary numbers, leading zeros are dropped like bin() would
+        Results are cached and shared between callers so the array is returned read only'''
+        payload = payload.strip()
+        if len(payload) % 2:
+            payload = '0' + payload
+        bits = np.unpackbits(np.frombuffer(bytes.fromhex(payload), dtype=np.uint8))
+        bits.flags.writeable = False
+        if not bits.any():
+            return bits[-1:]
+        return bits[np.argmax(bits):]
+
+    def binarySimilar(self, captured_payload_binary, keyfob_programming_binary):
+        '''Returns the ratio of matching bits between 2 binary payloads lined up from the first bit,
+        bits past the end of the shorter payload count as mismatches'''
+        length = min(len(captured_payload_binary), len(keyfob_programming_binary))
+        matches = np.count_nonzero(captured_payload_binary[:length] == keyfob_programming_binary[:length])
+        return matches / max(len(captured_payload_binary), len(keyfob_programming_binary))
 
     def getHighestPercent(self, myDictionary):
         ''' Takes a dictonary of signals as keys and returns the signal with the highest percent value'''
@@ -115,19 +132,29 @@ class Clicker():
         return highest_percent[1]
 
     def openImage(self, path):
-        '''Opens and image from the hardrive based on the path sent in'''
-        imageViewerFromCommandLine = {'linux':'eog',
-                                      'linux2':'eog',
-                                      'win32':'explorer',    #doubt this works in windows but leaving it here for now
-                                      'darwin':'open'}[sys.platform]
-        subprocess.call([imageViewerFromCommandLine, path])
+        '''Opens and image from the hardrive based on the path sent in, the viewer runs in the background
+        and a new one is only started once the previous viewer has been closed'''
+        if image_viewer is None:
+            print(f"No image viewer known for {sys.platform}, open {path} manually")
+            return
+        if self.viewer is not None and self.viewer.poll() is None:
+            return
+        self.viewer = subprocess.Popen([image_viewer, path], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def timeAxis(length):
+        '''Returns the x axis used to step plot a signal, payload sizes repeat so these are cached read only'''
+        axis = 0.5 * np.arange(length)
+        axis.flags.writeable = False
+        return axis
 
     def createGraph(self, captured_payload_binary, keyfob_programming_binary):
         '''Sets up the graphing elements for images or display, requires 2 binary payloads to plot'''
         payload_data = np.repeat(captured_payload_binary, 2)
         keyfob_data = np.repeat(keyfob_programming_binary, 2)
-        t = 0.5 * np.arange(len(payload_data))
-        u = 0.5 * np.arange(len(keyfob_data))
+        t = self.timeAxis(len(payload_data))
+        u = self.timeAxis(len(keyfob_data))
 
         #Used to show the wave form
         plt.step(t, payload_data + 4, 'r', linewidth = 2, where='post')
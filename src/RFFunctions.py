@@ -1,86 +1,110 @@
 from rflib import *
-import bitstring
-import time, sys
+import time, re, sys, threading, queue
 sys.dont_write_bytecode = True
-from difflib import SequenceMatcher
+
+#Runs of 3 or more 0's separate the individual signals in a capture
+zero_run = re.compile('000+')
+
+#Escaped \x form of every byte value used when formatting payloads
+hex_escapes = [f'\\x{i:02x}' for i in range(256)]
 
 #-----------------Start RF Capture ----------------#
 def capturePayload(d, rolling_code, rf_settings):
     '''Starts a listener and returns a RFrecv capture of your choice and signal strength
     If there is rolling code options sent it will check for valid packets while jammer is running'''
 
-
-    capture = ""        #Capture without Rolling code
-    roll_captures = []  #List of captures for RollingCode
-
-    roll_count = 0      #used to count 2 captures
-    while True:
-        try:
-            y, z = d.RFrecv()
-            capture = y.hex()
-            try:
-                signal_strength = 0 - int.from_bytes(d.getRSSI(), byteorder='big')
-            except:
-                signal_strength = 0
-        except ChipconUsbTimeoutException:
-            pass
-
-        #This block is used for rolling code things
-        if rolling_code and capture:           #If there is a good capture and we are attacking rollingCode execute this block
+    #This block is used for rolling code things
+    if rolling_code:
+        roll_captures = []  #List of captures for RollingCode
+        while True:
+            received = receiveCapture(d)
+            if not received:
+                continue
+            capture, signal_strength = received
             print(f"SIGNAL STRENGTH: {str(signal_strength)}")
             print(f"RF CAPTURE: \n {capture} \n")
-            decision = determineRealTransmission(signal_strength, rf_settings)
-            if decision:
+            if determineRealTransmission(signal_strength, rf_settings):
                 roll_captures.append(capture)  #add key with good decision to the list
-                if roll_count >= 1:            #Check if we have 2 keys and return.
+                if len(roll_captures) == 2:    #Check if we have 2 keys and return.
                     return roll_captures, signal_strength
-                else:
-                    roll_count +=1
-                    continue
-            else:
-                continue
 
-        #This block is when just capturing and returning, no rolling code
-        elif capture and not rolling_code:
+    #This block is when just capturing and returning, no rolling code
+    #The radio keeps receiving in the background while waiting on the y/n prompt
+    captures = queue.Queue(maxsize=16)
+    stop = threading.Event()
+    pump = threading.Thread(target=pumpCaptures, args=(d, captures, stop), daemon=True)
+    pump.start()
+    try:
+        while True:
+            received = captures.get()
+            if isinstance(received, Exception):
+                raise received  #the radio failed in the background receiver
+            capture, signal_strength = received
             print(f"SIGNAL STRENGTH: {str(signal_strength)}")
             print(f"RF CAPTURE: \n {capture} \n")
             try:
                 response = input("Do you want to return the above payload? (y/n)")
                 if response.lower() == 'y':
-                    break
-                elif response.lower() == 'n':
-                    capture =""
-                else:
+                    return capture, signal_strength
+                elif response.lower() != 'n':
                     print("You did not enter a valid response of y or n capture not saved")
-                    capture = ""
-                    
+
             except Exception as e:
                 print(f"Error during input: {e}")
-                capture = ""            
-
-    return capture, signal_strength
+    finally:
+        stop.set()
+        pump.join()
+
+def receiveCapture(d, timeout=500):
+    '''Waits on RFrecv for a packet and returns its hex and signal strength, None if the USB read timed out or was empty
+    The short timeout keeps the capture loops responsive and lets the background receiver stop quickly'''
+    try:
+        y, z = d.RFrecv(timeout=timeout)
+    except ChipconUsbTimeoutException:
+        return None
+    if not y:
+        return None
+    try:
+        signal_strength = -d.getRSSI()[0]   #RSSI register is peeked as a single byte
+    except Exception:
+        signal_strength = 0
+    return y.hex(), signal_strength
+
+def pumpCaptures(d, captures, stop):
+    '''Receives captures in the background until stopped, a full queue drops the oldest capture
+    Any error from the radio is queued instead so the waiting caller raises it'''
+    try:
+        while not stop.is_set():
+            received = receiveCapture(d)
+            if received:
+                queueLatest(captures, received)
+    except Exception as e:
+        queueLatest(captures, e)
+
+def queueLatest(captures, item):
+    '''Puts an item on the queue without blocking, dropping the oldest entries when it is full'''
+    while True:
+        try:
+            captures.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                captures.get_nowait()
+            except queue.Empty:
+                pass
 
 
 #----------------- Determine Real Transmission ----------------#
 def determineRealTransmission(signal_strength, rf_settings):
     ''' Used to search for transmissions which are not max power and fall between
-    defined RSSI power levels'''
-    if signal_strength > rf_settings.upper_rssi and signal_strength < rf_settings.lower_rssi:
-        return True
-    return False
+    defined RSSI power levels, the two levels can be given in either order'''
+    return signal_strength in rf_settings.rssi_window
 
 #------------Split Captures by 4 or more 0's --------------------#
 def splitCaptureByZeros(capture):
     '''Parse Hex from the capture by reducing 0's '''
 
-    payloads = re.split('0000*', capture)
-    items = []
-    for payload in payloads:
-
-        if len(payload) > 5:
-            items.append(payload)
-
-    return items
+    return [payload for payload in zero_run.split(capture) if len(payload) > 5]
 
 
 #------------Split Device Settings Configuration --------------------#
@@ -88,7 +112,8 @@ def parseDeviceSettings(file_data):
     '''Parse file device configuration and return list'''
     settings = []
     for data in file_data:
-        settings.append(re.split(':', data))
+        key, _, value = data.partition(':')
+        settings.append([key, value])
     print (settings)
     return settings
 
@@ -101,9 +126,7 @@ def printFormatedHex(payload):
     formatedPayload = ""
     if (len(payload) % 2 == 0):
         print (f"The following payload is currently being formated: {payload}")
-        iterator = iter(payload)
-        for i in iterator:
-            formatedPayload += ('\\x'+i + next(iterator))
+        formatedPayload = ''.join([hex_escapes[b] for b in bytes.fromhex(payload)])
 
     return formatedPayload
 
@@ -115,13 +138,18 @@ def createBytesFromPayloads(payloads):
     formatedPayloads = []
 
     for payload in payloads:
-        binary = bin(int(payload,16))[2:]
-        formatedPayloads.append(turnToBytes(binary))
+        payload = payload.strip()
+        if len(payload) % 2:
+            payload = '0' + payload
+        formatedPayloads.append(bytes.fromhex(payload))
     return formatedPayloads
 
 def turnToBytes(binary):
-    ''' Converts binary payloads into sendable byte payloads'''
-    payloadBytes = bitstring.BitArray(bin=(binary)).tobytes()
+    ''' Converts binary payloads into sendable byte payloads, the last byte is padded with 0's'''
+    if not binary:
+        return b''
+    padding = -len(binary) % 8
+    payloadBytes = (int(binary, 2) << padding).to_bytes((len(binary) + padding) // 8, 'big')
     return payloadBytes
 
 #------------Send Transmission--------------------#
@@ -133,16 +161,12 @@ def sendTransmission(payload, d):
 
 #-------------------Parse the log file------------#
 def parseSignalsFromLog(log_file):
-    '''Creates a multidimentional array of signals from a logfile split by 0000's'''
-    payloads=[]
+    '''Yields the signals of each capture in a logfile split by 0000's, one list per capture line
+    Wrap it in list() if the signals are needed more than once'''
     with open(log_file) as f:
         for line in f:
             if "found" not in line:
-                payloads.append(splitCaptureByZeros(line))
-    return payloads
-
-def similar(a, b):
-    return SequenceMatcher(None, a, b).ratio()
+                yield splitCaptureByZeros(line)
 
 #-------------------Parse single Log Entry From live Clicker------------#
 def parseSignalsLive(click):
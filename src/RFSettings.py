@@ -1,27 +1,36 @@
 import sys
+from dataclasses import dataclass, field, fields
 sys.dont_write_bytecode = True
 
+@dataclass(slots=True)
 class RFSettings():
     '''This class is used to setup RFCat settings needed for listening, jamming and sending'''
-    def __init__(self, frequency, baud_rate, channel_bandwidth, modulation_type, upper_rssi, lower_rssi, channel_spacing, deviation):
+    frequency: int
+    baud_rate: int
+    channel_bandwidth: int
+    modulation_type: str
+    upper_rssi: int
+    lower_rssi: int
+    channel_spacing: int
+    deviation: int
+    rssi_window: range = field(init=False, repr=False)   #Derived from the rssi levels, not saved in templates
 
-        self.frequency = frequency
-        self.baud_rate = baud_rate
-        self.channel_bandwidth = channel_bandwidth
-        self.modulation_type = modulation_type
-        self.upper_rssi = upper_rssi
-        self.lower_rssi = lower_rssi
-        self.channel_spacing = channel_spacing
-        self.deviation = deviation
+    def __post_init__(self):
+        self.updateRssiWindow()
+
+    def updateRssiWindow(self):
+        '''Precomputes the RSSI values that count as a real transmission, strictly between the two levels in either order'''
+        weakest, strongest = sorted((self.upper_rssi, self.lower_rssi))
+        self.rssi_window = range(weakest + 1, strongest)
 
     def saveDeviceSettingsTemplate(self, rf_settings, device_name):
         '''Saves your current RF settings to a file in the device_templates folder which can be loaded in a later attack'''
         try:
             with open("./device_templates/"+device_name+".config", 'w') as file:
-                for key, value in rf_settings.__dict__.items():
-                    if not key.startswith("__"):
-                        print(f"{str(key)} : {str(value)}")
-                        file.write(str(key)+ ":" +str(value) +"\n")
+                for key in self.setting_types:
+                    value = getattr(rf_settings, key)
+                    print(f"{str(key)} : {str(value)}")
+                    file.write(str(key)+ ":" +str(value) +"\n")
                 print(f"Saved file as: ./device_templates/{device_name}.config")
         except IOError as e:
             print(f"Error saving device settings: {e}")
@@ -30,39 +39,15 @@ class RFSettings():
         '''Loads your previously saved working settings for attack against a device'''
         try:
             for data in file_data:
-                if "frequency" in data:
-                    frequency = self.splitData(data)
-                    self.frequency = int(frequency)
-                elif "baud_rate" in data:
-                    baud_rate = self.splitData(data)
-                    self.baud_rate = int(baud_rate)
-                elif "channel_bandwidth" in data:
-                    channel_bandwidth = self.splitData(data)
-                    self.channel_bandwidth = int(channel_bandwidth)
-                elif "modulation_type" in data:
-                    modulation_type = self.splitData(data)
-                    self.modulation_type = modulation_type
-                elif "upper_rssi" in data:
-                    upper_rssi = self.splitData(data)
-                    self.upper_rssi = int(upper_rssi)
-                elif "lower_rssi" in data:
-                    lower_rssi = self.splitData(data)
-                    self.lower_rssi = int(lower_rssi)
-                elif "channel_spacing" in data:
-                    channel_spacing = self.splitData(data)
-                    self.channel_spacing = int(channel_spacing)
-                elif "deviation" in data:
-                    deviation = self.splitData(data)
-                    self.deviation = int(deviation)
+                key, _, value = data.partition(":")
+                key = key.strip()
+                if key in self.setting_types:
+                    setattr(self, key, self.setting_types[key](value.strip()))
         except Exception as e:
-            print(f"Error loading device settings: {e}")        
+            print(f"Error loading device settings: {e}")
+        self.updateRssiWindow()
         self.printSettings()
 
-    def splitData(self, data):
-        key, value = data.split(":")
-        value = value.strip()
-        return value
-
     def printSettings(self):
         '''Prints the current RFCat Settings in use'''
         print ("The following settings are in use:")
@@ -74,3 +59,6 @@ class RFSettings():
         print (f"Lower_rssi: {str(self.lower_rssi)}")
         print (f"Channel_spacing: {str(self.channel_spacing)}")
         print (f"Deviation: {str(self.deviation)}")
+
+#Settings that can be loaded from a device template and the type each value is stored as
+RFSettings.setting_types = {f.name: f.type for f in fields(RFSettings) if f.init}
@@ -1,6 +1,8 @@
 
 from . import RFFunctions as tools
 from . import findDevices, jam, utilities
+from rflib import keystop
+from itertools import cycle
 import time, sys
 sys.dont_write_bytecode = True
 #-----------------Rolling Code-------------------------#
@@ -70,19 +72,20 @@ def replayLiveCapture(d, rolling_code, rf_settings):
 def replaySavedCapture(d, uploaded_payload):
     '''Used to import an old capture and replay it from a file'''
     with open(uploaded_payload) as f:
-        payloads = f.readlines()
+        payloads = f.read().split()    #one payload per line, blank lines and newlines are dropped
         print(payloads)
         payloads = tools.createBytesFromPayloads(payloads)
 
         response = input( "Send once, or forever? (o/f) Default = o ")
 
         if response.lower() == "f":
-            print("\nNOTE: TO STOP YOU NEED TO CTRL-Z and Unplug/Plug IN YARDSTICK-ONE\n")
-            while True:
-                for payload in payloads:
-                    print("WAITING TO SEND")
-                    time.sleep(1)          #You may not want this if you need rapid fire tx
-                    tools.sendTransmission(payload ,d)
+            print("\nPress enter to stop sending\n")
+            for payload in cycle(payloads):
+                if keystop():              #Checked before every payload so long lists stop right away
+                    break
+                print("WAITING TO SEND")
+                time.sleep(1)          #You may not want this if you need rapid fire tx
+                tools.sendTransmission(payload ,d)
 
         else:
             for payload in payloads:
@@ -104,10 +107,9 @@ def deBruijn(d):
         print("Invalid input. Please enter a valid integer.")
         return
     try:
-        binary = utilities.generate_de_bruijn_sequence(2, response)
-        payload = tools.turnToBytes(binary)
+        payload = utilities.generate_de_bruijn_bits(length)
         
-        print(f"Sending {str(len(binary))} bits length binary deBruijn payload formated to bytes")
+        print(f"Sending {str(2 ** length)} bits length binary deBruijn payload formated to bytes")
         print(f'Payload used {payload}')
         tools.sendTransmission(payload ,d)
         
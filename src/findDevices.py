@@ -1,40 +1,43 @@
 from rflib import *
-import time, re, sys
+import time, re, sys, os, atexit
 sys.dont_write_bytecode = True
 
-capture = ""
 mytime = time.strftime('%b%d_%X')
+scan_log = "./scanning_logs/"+mytime+".log"     #Log for this run's scans, named on import
+clicks_log = "./captures/capturedClicks.log"    #Log shared with logTail for live signal comparison
+log_fds = {}    #Open scanning log file descriptors by filename, kept open for the whole scan
+found_header = "A signal was found on :"   #Starts the line logged before every capture
 
 def bruteForceFreq(d, rf_settings, interval, clicker=False):
     '''Brute Forces frequencies looking for one with data being sent
        Requires a RFCat Class, a starting frequency and the incrementing interval
        EX: 315000000, 50000'''
-    d.setFreq(rf_settings.frequency)
     current_freq = rf_settings.frequency
-    filename = "./scanning_logs/"+mytime+".log"
+    filename = scan_log
 
     while not keystop():
+        d.setFreq(current_freq)
         print (f"Currently Scanning: {str(current_freq)} To cancel hit enter and wait a few seconds")
         sniffFrequency(d, current_freq, filename, clicker)
 
         current_freq +=interval
-        d.setFreq(current_freq)
-    print (f"Saved logfile as: ./scanning_logs/{mytime}.log")
+    print (f"Saved logfile as: {filename}")
 
 def searchKnownFreqs(d, known_frequencies, clicker=False):
     '''Sniffs on a rotating list of known frequences from the default list
         or optionally uses a list provided to the function requires an RFCat class'''
-    filename = "./scanning_logs/"+mytime+".log"
+    filename = clicks_log if clicker else scan_log
+
+    #Retuning is a USB round trip, only do it when the frequency actually changes
+    tuned_freq = None
     while not keystop():
 
         for current_freq in known_frequencies:
-            d.setFreq(current_freq)
+            if current_freq != tuned_freq:
+                d.setFreq(current_freq)
+                tuned_freq = current_freq
             print(f"Currently Scanning: {str(current_freq)} To cancel hit enter and wait a few seconds")
-            #print <-- wtf do I have a print here for? removed see if it breaks something
-            if clicker:
-                sniffFrequency(d, current_freq, "./captures/capturedClicks.log", clicker)
-            else:
-                sniffFrequency(d, current_freq, filename, clicker)
+            sniffFrequency(d, current_freq, filename, clicker)
     print(f"Saved logfile as: {filename}")
 
 def sniffFrequency(d, current_freq, filename, clicker):
@@ -60,7 +63,18 @@ def sniffFrequency(d, current_freq, filename, clicker):
             pass
         return
 
-def saveLogs(current_freq, capture, filename=" "):
-    ''' Used to create logs for scanning known and bruteforcing frequencies'''
-    with open(filename, 'a+') as file:
-        file.write("A signal was found on :" + str(current_freq)+"\n" + capture+"\n")
+def saveLogs(current_freq, capture, filename=scan_log):
+    ''' Used to create logs for scanning known and bruteforcing frequencies
+    The file stays open between captures and each entry is one unbuffered append so logTail sees it right away'''
+    fd = log_fds.get(filename)
+    if fd is None:
+        fd = log_fds[filename] = os.open(filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    os.write(fd, f"{found_header}{current_freq}\n{capture}\n".encode())
+
+def closeLogs():
+    ''' Closes any scanning logs left open by saveLogs'''
+    for fd in log_fds.values():
+        os.close(fd)
+    log_fds.clear()
+
+atexit.register(closeLogs)
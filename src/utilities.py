@@ -1,85 +1,209 @@
-import time, os
+import time, os, sys, argparse, functools, select, threading, ctypes, ctypes.util, concurrent.futures
 from . import findDevices
 from . import RFFunctions as tools
 from . import Clicker
 
+#inotify event masks from sys/inotify.h
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+
+#-----------------Start Log Watching ----------------#
+class LogWatcher():
+    '''Waits for a file to change, on linux it blocks on inotify events and everywhere else
+    it falls back to sleeping for the poll interval'''
+    def __init__(self, path, poll_interval=1):
+        self.poll_interval = poll_interval
+        self.fd = None
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or libc_name is None:
+            return
+        try:
+            libc = ctypes.CDLL(libc_name, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK)
+        except (OSError, AttributeError, TypeError):
+            return
+        if fd < 0:
+            return
+        mask = IN_MODIFY | IN_ATTRIB | IN_DELETE_SELF | IN_MOVE_SELF
+        if libc.inotify_add_watch(fd, os.fsencode(path), mask) < 0:
+            os.close(fd)
+            return
+        self.fd = fd
+
+    def wait(self):
+        '''Returns once the file changed or the poll interval passed'''
+        if self.fd is None:
+            time.sleep(self.poll_interval)
+            return
+        readable, _, _ = select.select([self.fd], [], [], self.poll_interval)
+        if readable:
+            try:
+                os.read(self.fd, 4096)  #drain the queued events, only the wakeup matters
+            except BlockingIOError:
+                pass
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+#-----------------End Log Watching ----------------#
+
 #-----------------Start Log Tailing ----------------#
 def logTail(my_clicker):
     ''' This function acts as a linux tail function but only pulling new additions to a file since running
-    it parses for payload lines which is uses in analysis and graphing'''
-    capture_log = "./captures/capturedClicks.log"
+    it parses for payload lines which is uses in analysis and graphing
+    If the log is rotated or truncated it is reopened and followed from the start'''
+    capture_log = findDevices.clicks_log
+    found_header = findDevices.found_header.encode()
+    watcher = LogWatcher(capture_log)
+    fd = None
     try:
-        with open(capture_log, 'r') as file:
-
-            #Find the size of the file and move to the end
-            st_results = os.stat(capture_log)
-            st_size = st_results[6]
-            file.seek(st_size)
-
-            while True:
-                where = file.tell()
-                line = file.readline()
-                if not line:
-                    time.sleep(1)
-                    file.seek(where)
-                else:
-                    if "found" not in line:
-                        presses = tools.parseSignalsLive(line)
-                        my_clicker.keyfob_payloads = presses
-                        percent = my_clicker.liveClicks()
-    
+        fd = openLog(capture_log)
+
+        #Move to the end of the file so only new captures are analysed
+        os.lseek(fd, 0, os.SEEK_END)
+
+        pending = b""    #a line still being written when we read, finished on a later wakeup
+        while True:
+            watcher.wait()
+            data = readNewData(fd)
+            if not data:
+                #Nothing new, make sure we are still reading the file the clicker writes to
+                if logReplaced(fd, capture_log):
+                    os.close(fd)
+                    fd = None   #so a failed reopen is not closed again on the way out
+                    fd = openLog(capture_log)
+                    watcher.close()
+                    watcher = LogWatcher(capture_log)
+                    pending = b""
+                continue
+            lines = (pending + data).split(b"\n")
+            pending = lines.pop()
+
+            #Everything that arrived since the last wakeup is analysed together in one pass
+            #lines are filtered as bytes on their header and only the captures that are kept get decoded
+            presses = []
+            for line in lines:
+                if line and not line.startswith(found_header):
+                    presses.extend(tools.parseSignalsLive(line.decode()))
+            if presses:
+                my_clicker.updateLive(presses)
+
     except IOError as e:
         print(f"Error opening or reading from {capture_log}: {e}")
+    finally:
+        if fd is not None:
+            os.close(fd)
+        watcher.close()
+
+def openLog(path):
+    '''Opens a log for tailing as a raw non blocking file descriptor'''
+    return os.open(path, os.O_RDONLY | getattr(os, 'O_NONBLOCK', 0))
+
+def readNewData(fd, chunk_size=65536):
+    '''Reads everything appended to the log since the last read in large chunks, empty bytes if nothing is new'''
+    chunks = []
+    while True:
+        try:
+            chunk = os.read(fd, chunk_size)
+        except BlockingIOError:
+            break
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+def logReplaced(fd, path):
+    '''Returns True when path now names a different file than the open one or the open file was truncated,
+    a log that was moved away but not recreated yet keeps being followed'''
+    try:
+        path_stat = os.stat(path)
+    except FileNotFoundError:
+        return False
+    return not os.path.samestat(path_stat, os.fstat(fd)) or path_stat.st_size < os.lseek(fd, 0, os.SEEK_CUR)
 
 #-----------------End Log Tailing ----------------#
 
 
 #-----------------Start De Bruijn Creation ----------------#
+def deBruijnSymbols(k, n):
+    '''Returns the de Bruijn sequence for alphabet size k and length n as symbol indexes
+    Lyndon words are generated iteratively in lexicographic order and the ones whose length divides n are joined'''
+    #The sequence is always k**n symbols long so it is written into a preallocated buffer
+    sequence = bytearray(k ** n) if k <= 256 else [0] * (k ** n)
+    position = 0
+    word = [-1]
+    while word:
+        word[-1] += 1
+        length = len(word)
+        if n % length == 0:
+            sequence[position:position + length] = word
+            position += length
+        #Repeat the word out to n symbols then drop trailing max symbols to get the next Lyndon word
+        while len(word) < n:
+            word.append(word[len(word) - length])
+        while word and word[-1] == k - 1:
+            word.pop()
+    return sequence
+
+@functools.lru_cache(maxsize=32)
 def generate_de_bruijn_sequence(k, n):
-    '''Generates the de Bruijn sequence for given k and n'''
+    '''Generates the de Bruijn sequence for given k and n, k is the alphabet size or a string of the alphabet
+    Results are cached since the same sequence is often requested again while bruteforcing'''
     if isinstance(k, str):
         alphabet = list(k)
         k = len(alphabet)
     else:
         alphabet = list(map(str, range(k)))
+    sequence = deBruijnSymbols(k, int(n))
 
-    a = [0] * (k * int(n))
-    sequence = []
-
-    def db(t, p):
-        if t == int(n) * k:
-            if int(n) % p == 0:
-                sequence.extend(a[1:p + 1])
-        else:
-            a[t] = a[t - p]
-            db(t + 1, p)
-            for j in range(a[t - p] + 1, k):
-                a[t] = j
-                db(t + 1, t)
-    db(1, 1)
+    #Single character ascii alphabets are mapped in one pass with a translation table
+    if all(len(symbol) == 1 and symbol.isascii() for symbol in alphabet):
+        table = "".join(alphabet).encode().ljust(256, b'\0')
+        return sequence.translate(table).decode()
     return "".join(alphabet[i] for i in sequence)
 
+def async_de_bruijn_sequence(k, n):
+    '''Starts generate_de_bruijn_sequence in the background and returns a Future for the sequence,
+    long sequences can then be built while the dongle is being set up
+    The worker is a daemon thread so exiting early, like when no dongle is found, never waits on it'''
+    future = concurrent.futures.Future()
+
+    def generate():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(generate_de_bruijn_sequence(k, n))
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=generate, daemon=True).start()
+    return future
+
+@functools.lru_cache(maxsize=16)
+def generate_de_bruijn_bits(n):
+    '''Generates the binary de Bruijn sequence of length n packed 8 bits to a byte, ready to send
+    The sequence is 2**n bits so the last byte is padded with 0's when n < 3'''
+    sequence = deBruijnSymbols(2, int(n))
+    return tools.turnToBytes(sequence.translate(b'01'.ljust(256, b'\0')))
+
 #-----------------End De Bruijn Creation ----------------#
 
-def count_provided_args(args, parser):
-    # Count arguments that were explicitly provided by the user
-    provided_args = 0
-    for action in parser._actions:
-        # Skip the help action
-        if action.dest == 'help':
-            continue
-        
-        # Check if the argument was provided by the user
-        if hasattr(args, action.dest):
-            value = getattr(args, action.dest)
-            
-            # For store_true actions, check if they were explicitly set
-            if action.const is not None and value == action.const:
-                provided_args += 1
-            
-            # For other arguments, check if they differ from the default
-            elif hasattr(action, 'default'):
-                if value != action.default:
-                    provided_args += 1
-    
-    return provided_args
+def count_provided_args(parser, argv=None):
+    '''Counts the options the user typed on the command line, help excluded
+    The arguments are parsed again with every default suppressed so only given options end up in the namespace,
+    which resolves abbreviations, combined short flags and attached values exactly like argparse does'''
+    if argv is None:
+        argv = sys.argv[1:]
+    defaults = [(action, action.default) for action in parser._actions]
+    try:
+        for action, _ in defaults:
+            action.default = argparse.SUPPRESS
+        provided = parser.parse_args(argv)
+    finally:
+        for action, default in defaults:
+            action.default = default
+    return len(vars(provided))